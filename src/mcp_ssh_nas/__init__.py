@@ -1,5 +1,19 @@
 """mcp-ssh-nas: SSH NAS operations as Python library, LangChain tools, and MCP server."""
 
-from .client import SSHClient
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import SSHClient
 
 __all__ = ["SSHClient"]
+
+
+def __getattr__(name: str):
+    # PEP 562 lazy import: `import mcp_ssh_nas` alone should not pull in
+    # paramiko and its crypto stack -- that only happens when SSHClient
+    # is actually referenced.
+    if name == "SSHClient":
+        from .client import SSHClient
+
+        return SSHClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
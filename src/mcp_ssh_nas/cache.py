@@ -0,0 +1,48 @@
+"""In-memory TTL caching for repeated read-only lookups."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+
+class TTLCache:
+    """Small thread-safe cache whose entries expire after a fixed TTL.
+
+    Lives purely in process memory; meant for second-scale reuse of
+    read-only command output between agent polling loops, not durable
+    caching.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: dict[Any, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, ttl: float | None = None) -> Any:
+        """Return the cached value, or None if absent or expired."""
+        if ttl is None:
+            ttl = self.ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= ttl:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value under key with the current timestamp."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, key: Any = None) -> None:
+        """Drop one entry, or everything when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
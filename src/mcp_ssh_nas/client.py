@@ -2,20 +2,63 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import io
+import json
 import os
+import select
+import shlex
+import socket
+import threading
+import time
+from typing import Iterator
 
 import paramiko
 
+try:  # optional C serializer, ~5-10x faster than stdlib json for small dicts
+    import orjson
+except ImportError:
+    orjson = None
+
+from mcp_ssh_nas.cache import TTLCache
 from mcp_ssh_nas.config import get_settings
 
+# Bytes per Channel.recv call when draining command output. Sized to
+# cover the whole channel window so large outputs drain in few Python
+# iterations; recv returns whatever is buffered, so small outputs are
+# unaffected.
+_RECV_CHUNK = 1 << 20
+
+# Select timeout while waiting for more channel data.
+_POLL_INTERVAL = 0.05
+
+# Channel flow-control sizing: large windows keep high-latency links busy
+# instead of stalling on SSH window updates (default is only 2 MB / 32 KB).
+_CHANNEL_WINDOW = 4 * 1024 * 1024
+_CHANNEL_MAX_PACKET = 262144
+
+# Seconds since the last successful command before an idle connection is
+# re-verified with a real channel-open probe.
+_PROBE_INTERVAL = 60
+
 
 class SSHClient:
-    """Manages a paramiko SSH connection to the NAS.
+    """Manages a persistent paramiko SSH connection to the NAS.
 
     Reads configuration from environment variables (NAS_* prefix),
     .env file, or explicit constructor parameters.
+
+    The underlying Transport is kept alive across calls (ControlMaster
+    style); each command runs on its own cheap session channel, and a
+    reconnect only happens when the transport is actually dead.
     """
 
+    # Transport.open_session is thread-safe and paramiko releases the
+    # GIL during socket I/O, so commands from separate threads genuinely
+    # overlap. Backends without this property set the flag to False.
+    supports_concurrency = True
+
     def __init__(
         self,
         host: str | None = None,
@@ -28,12 +71,22 @@ class SSHClient:
         self.port = port or settings.port
         self.user = (user or settings.user).strip()
         self.password = (password or settings.password).strip()
+        self.compression = settings.compression
+        self.cache_ttl = settings.cache_ttl
+        self._configured = bool(self.host and self.user and self.password)
         self._client: paramiko.SSHClient | None = None
+        self._transport: paramiko.Transport | None = None
+        self._sftp: paramiko.SFTPClient | None = None
+        self._last_ok = 0.0
+        self._cache = TTLCache(self.cache_ttl)
+        # Guards connect/reconnect; command execution itself is reentrant
+        # because every call opens its own channel on the shared transport.
+        self._connect_lock = threading.Lock()
 
     @property
     def configured(self) -> bool:
         """Check if NAS credentials are set."""
-        return bool(self.host and self.user and self.password)
+        return self._configured
 
     def _connect(self) -> paramiko.SSHClient:
         """Create a new SSH connection."""
@@ -45,28 +98,181 @@ class SSHClient:
             username=self.user,
             password=self.password,
             timeout=30,
+            # Compression must be requested before key exchange to be
+            # negotiated; enabling it afterwards is a no-op.
+            compress=self.compression,
         )
+        transport = client.get_transport()
+        if transport is not None:
+            transport.set_keepalive(30)
+            try:
+                # Short commands are tiny writes; Nagle + delayed ACK can
+                # add 40-200 ms per exchange without this.
+                transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except Exception:
+                pass
         return client
 
     def _get_client(self) -> paramiko.SSHClient:
-        """Get or create an SSH client connection with reconnect on failure."""
+        """Get or create an SSH client connection with reconnect on failure.
+
+        Liveness is checked from the transport state (kept fresh by the
+        keepalive) instead of running a remote command, so healthy
+        connections pay no extra round-trip. A real channel-open probe is
+        only issued when the connection has been idle for a while.
+        """
+        with self._connect_lock:
+            return self._get_client_locked()
+
+    def _get_client_locked(self) -> paramiko.SSHClient:
         if self._client is not None:
-            try:
-                self._client.exec_command("echo", timeout=5)
-                return self._client
-            except Exception:
+            transport = self._client.get_transport()
+            if transport is not None and transport.is_active() and transport.is_authenticated():
+                if time.monotonic() - self._last_ok < _PROBE_INTERVAL:
+                    return self._client
                 try:
-                    self._client.close()
+                    transport.open_session().close()
+                    self._last_ok = time.monotonic()
+                    return self._client
                 except Exception:
                     pass
-                self._client = None
+            try:
+                self._client.close()
+            except Exception:
+                pass
+            self._client = None
+            self._transport = None
+            self._sftp = None
 
         self._client = self._connect()
+        self._last_ok = time.monotonic()
         return self._client
 
-    def execute(self, command: str, timeout: int = 30) -> dict:
+    def _get_transport(self) -> paramiko.Transport:
+        """Get the underlying Transport, connecting if necessary.
+
+        All commands run over session channels multiplexed on this single
+        Transport, so only the first call pays the TCP + key-exchange cost.
+        """
+        client = self._get_client()
+        if self._transport is None or not self._transport.is_active():
+            self._transport = client.get_transport()
+        return self._transport
+
+    def sftp_client(self) -> paramiko.SFTPClient | None:
+        """Get a lazily-opened, cached SFTP channel over the same Transport.
+
+        Returns None when not configured or the SFTP subsystem is
+        unavailable, so callers can fall back to shell commands.
+        """
+        if not self.configured:
+            return None
+        if self._sftp is not None:
+            # Re-verify the underlying channel: after a NAS reboot or
+            # idle disconnect the cached client would otherwise raise on
+            # every call and never reconnect.
+            channel = self._sftp.get_channel()
+            if channel is not None and not channel.closed:
+                return self._sftp
+            self.invalidate_sftp()
+        try:
+            self._sftp = self._get_client().open_sftp()
+        except Exception:
+            return None
+        return self._sftp
+
+    def invalidate_sftp(self) -> None:
+        """Drop the cached SFTP channel so the next use reopens it.
+
+        Called by file operations when a request fails at the connection
+        level rather than with a per-file error.
+        """
+        if self._sftp is not None:
+            try:
+                self._sftp.close()
+            except Exception:
+                pass
+            self._sftp = None
+
+    def _pump_channel(
+        self,
+        channel: paramiko.Channel,
+        timeout: int,
+        max_bytes: int | None = None,
+    ) -> tuple[str, str, int]:
+        """Drain stdout and stderr from a channel concurrently.
+
+        Reads both streams as data arrives instead of serializing
+        recv_exit_status -> stdout.read() -> stderr.read(), so wall time
+        for chatty commands is bounded by the slowest stream rather than
+        the sum of all three stages. Chunks are decoded incrementally so
+        only one full copy of the output (the str) is ever held, not
+        bytes plus str.
+        """
+        make_decoder = codecs.getincrementaldecoder("utf-8")
+        stdout_decoder = make_decoder(errors="replace")
+        stdout_io = io.StringIO()
+        # Most commands never write to stderr; its decoder and buffer
+        # are only built once the first stderr byte arrives.
+        stderr_decoder = None
+        stderr_io = None
+        received = 0
+        deadline = time.monotonic() + timeout if timeout else None
+
+        while True:
+            drained = False
+            while channel.recv_ready():
+                data = channel.recv(_RECV_CHUNK)
+                if not data:
+                    break
+                received += len(data)
+                stdout_io.write(stdout_decoder.decode(data))
+                drained = True
+            while channel.recv_stderr_ready():
+                data = channel.recv_stderr(_RECV_CHUNK)
+                if not data:
+                    break
+                received += len(data)
+                if stderr_decoder is None:
+                    stderr_decoder = make_decoder(errors="replace")
+                    stderr_io = io.StringIO()
+                stderr_io.write(stderr_decoder.decode(data))
+                drained = True
+
+            if max_bytes is not None and received >= max_bytes:
+                channel.close()
+                exit_status = (
+                    channel.recv_exit_status() if channel.exit_status_ready() else 0
+                )
+                break
+
+            if (
+                channel.exit_status_ready()
+                and not channel.recv_ready()
+                and not channel.recv_stderr_ready()
+            ):
+                exit_status = channel.recv_exit_status()
+                break
+
+            if not drained:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise socket.timeout(f"Command timed out after {timeout}s")
+                select.select([channel], [], [], _POLL_INTERVAL)
+
+        stdout_io.write(stdout_decoder.decode(b"", True))
+        if stderr_decoder is None:
+            return stdout_io.getvalue(), "", exit_status
+        stderr_io.write(stderr_decoder.decode(b"", True))
+        return stdout_io.getvalue(), stderr_io.getvalue(), exit_status
+
+    def execute(self, command: str, timeout: int = 30, max_bytes: int | None = None) -> dict:
         """Execute a command on the NAS via SSH.
 
+        Args:
+            timeout: Seconds to wait for output before giving up.
+            max_bytes: Optional cap on buffered output; the channel is
+                closed once exceeded to bound memory.
+
         Returns:
             dict with keys: success, exit_code, stdout, stderr (or error).
         """
@@ -77,13 +283,21 @@ class SSHClient:
             }
 
         try:
-            client = self._get_client()
-            stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
+            transport = self._get_transport()
+            channel = transport.open_session(
+                window_size=_CHANNEL_WINDOW, max_packet_size=_CHANNEL_MAX_PACKET
+            )
+            try:
+                channel.settimeout(timeout)
+                channel.exec_command(command)
 
-            exit_status = stdout.channel.recv_exit_status()
-            stdout_text = stdout.read().decode("utf-8", errors="replace")
-            stderr_text = stderr.read().decode("utf-8", errors="replace")
+                stdout_text, stderr_text, exit_status = self._pump_channel(
+                    channel, timeout, max_bytes
+                )
+            finally:
+                channel.close()
 
+            self._last_ok = time.monotonic()
             return {
                 "success": exit_status == 0,
                 "exit_code": exit_status,
@@ -94,31 +308,261 @@ class SSHClient:
         except paramiko.AuthenticationException:
             return {"success": False, "error": "Authentication failed. Check username and password."}
         except paramiko.SSHException as e:
+            # Drop the (likely dead) connection so the next call reconnects.
+            self.close()
             return {"success": False, "error": f"SSH error: {str(e)}"}
         except Exception as e:
+            if not isinstance(e, socket.timeout):
+                # A timed-out command leaves the transport healthy; anything
+                # else is treated as a broken connection.
+                self.close()
             return {"success": False, "error": f"Connection error: {str(e)}"}
 
+    def execute_fast(self, command: str, timeout: int = 30) -> dict:
+        """Execute without waiting for the SSH exit-status message.
+
+        The exit code is piped through stdout via a sentinel printf and
+        the channel is abandoned at EOF, skipping the trailing half
+        round-trip of recv_exit_status. Worth it for fire-and-forget
+        commands where only success/failure matters; prefer execute()
+        when stderr fidelity is important.
+        """
+        if not self.configured:
+            return {
+                "success": False,
+                "error": "NAS credentials not configured. Set NAS_HOST, NAS_USER, and NAS_PASSWORD.",
+            }
+
+        wrapped = f"{command}; printf '\\004RC=%d\\004' $?"
+
+        try:
+            transport = self._get_transport()
+            channel = transport.open_session(
+                window_size=_CHANNEL_WINDOW, max_packet_size=_CHANNEL_MAX_PACKET
+            )
+            try:
+                channel.settimeout(timeout)
+                channel.exec_command(wrapped)
+
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                stdout_io = io.StringIO()
+                while True:
+                    data = channel.recv(_RECV_CHUNK)
+                    if not data:
+                        break
+                    stdout_io.write(decoder.decode(data))
+                stdout_io.write(decoder.decode(b"", True))
+
+                stderr_chunks = []
+                while channel.recv_stderr_ready():
+                    data = channel.recv_stderr(_RECV_CHUNK)
+                    if not data:
+                        break
+                    stderr_chunks.append(data)
+                stderr_text = b"".join(stderr_chunks).decode("utf-8", errors="replace")
+            finally:
+                channel.close()
+
+            text = stdout_io.getvalue()
+            marker = text.rfind("\x04RC=")
+            if marker != -1 and text.endswith("\x04"):
+                exit_status = int(text[marker + 4 : -1])
+                stdout_text = text[:marker]
+            else:
+                # Sentinel missing -- stream was truncated; report failure.
+                exit_status = -1
+                stdout_text = text
+
+            self._last_ok = time.monotonic()
+            return {
+                "success": exit_status == 0,
+                "exit_code": exit_status,
+                "stdout": stdout_text,
+                "stderr": stderr_text,
+            }
+
+        except paramiko.AuthenticationException:
+            return {"success": False, "error": "Authentication failed. Check username and password."}
+        except paramiko.SSHException as e:
+            self.close()
+            return {"success": False, "error": f"SSH error: {str(e)}"}
+        except Exception as e:
+            if not isinstance(e, socket.timeout):
+                self.close()
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+
+    def execute_stream(self, command: str, timeout: int = 30) -> Iterator[str]:
+        """Execute a command, yielding decoded output chunks as they arrive.
+
+        Constant-memory alternative to execute() for commands with large
+        output (e.g. long docker logs): the first chunk reaches the
+        caller without waiting for the remote side to finish. Stderr is
+        combined into the stream in arrival order; failures are yielded
+        as "Error: ..." lines, matching format_result conventions.
+        """
+        if not self.configured:
+            yield "Error: NAS credentials not configured. Set NAS_HOST, NAS_USER, and NAS_PASSWORD."
+            return
+
+        try:
+            transport = self._get_transport()
+            channel = transport.open_session(
+                window_size=_CHANNEL_WINDOW, max_packet_size=_CHANNEL_MAX_PACKET
+            )
+        except Exception as e:
+            yield f"Error: {str(e)}"
+            return
+
+        try:
+            channel.settimeout(timeout)
+            channel.set_combine_stderr(True)
+            channel.exec_command(command)
+
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            deadline = time.monotonic() + timeout if timeout else None
+
+            while True:
+                drained = False
+                while channel.recv_ready():
+                    data = channel.recv(_RECV_CHUNK)
+                    if not data:
+                        break
+                    text = decoder.decode(data)
+                    if text:
+                        yield text
+                    drained = True
+
+                if channel.exit_status_ready() and not channel.recv_ready():
+                    break
+
+                if not drained:
+                    if deadline is not None and time.monotonic() > deadline:
+                        yield f"Error: Command timed out after {timeout}s"
+                        return
+                    select.select([channel], [], [], _POLL_INTERVAL)
+
+            tail = decoder.decode(b"", True)
+            if tail:
+                yield tail
+            self._last_ok = time.monotonic()
+        except Exception as e:
+            yield f"Error: {str(e)}"
+        finally:
+            channel.close()
+
+    def execute_cached(
+        self,
+        command: str,
+        timeout: int = 30,
+        ttl: float | None = None,
+        refresh: bool = False,
+    ) -> dict:
+        """Execute a read-only command, serving repeats from a short TTL cache.
+
+        Agents tend to re-ask for system facts (uptime, disk, memory)
+        within the same reasoning step; a couple of seconds of caching
+        turns those repeats into dictionary lookups instead of SSH
+        round-trips. Only successful results are cached. Never use this
+        for commands with side effects.
+
+        Args:
+            refresh: Skip the cache lookup and run the command, but still
+                store the fresh result so later callers see it.
+        """
+        if ttl is None:
+            ttl = self.cache_ttl
+        if ttl <= 0:
+            return self.execute(command, timeout)
+
+        if not refresh:
+            cached = self._cache.get(command, ttl)
+            if cached is not None:
+                return cached
+
+        result = self.execute(command, timeout)
+        if result.get("success"):
+            self._cache.set(command, result)
+        else:
+            self._cache.invalidate(command)
+        return result
+
+    async def aexecute(self, command: str, timeout: int = 30, max_bytes: int | None = None) -> dict:
+        """Async variant of execute, run in a worker thread.
+
+        Paramiko releases the GIL during socket I/O, so concurrent calls
+        (e.g. asyncio.gather over several tools) genuinely overlap their
+        network round-trips.
+        """
+        return await asyncio.to_thread(self.execute, command, timeout, max_bytes)
+
     def close(self) -> None:
         """Close the SSH connection."""
+        if self._sftp is not None:
+            try:
+                self._sftp.close()
+            except Exception:
+                pass
+            self._sftp = None
         if self._client is not None:
             try:
                 self._client.close()
             except Exception:
                 pass
             self._client = None
+        self._transport = None
+
+
+def create_client(**kwargs) -> "SSHClient":
+    """Build an SSH client using the backend named by MCP_SSH_BACKEND.
+
+    ``ssh2`` selects the optional libssh2 backend (install the ``ssh2``
+    extra); anything else gets the default paramiko SSHClient. Both
+    expose the same execute/close surface, so callers treat the return
+    value as an SSHClient.
+    """
+    if os.environ.get("MCP_SSH_BACKEND") == "ssh2":
+        from mcp_ssh_nas.client_ssh2 import SSH2Client
+
+        return SSH2Client(**kwargs)
+    return SSHClient(**kwargs)
+
+
+def dump_json(data) -> str:
+    """Serialize a tool response to compact JSON, via orjson when installed.
+
+    Tool output is consumed by models, not humans, so no indentation:
+    compact output is smaller on the wire and cheaper to produce.
+    """
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"))
+
+
+def quote_path(path: str) -> str:
+    """Shell-quote a path while keeping a leading ~ expandable.
+
+    shlex.quote('~') yields the literal '~', which the remote shell no
+    longer expands -- breaking the default home-directory paths the file
+    tools use. Quote only the part after the tilde.
+    """
+    if path == "~":
+        return "~"
+    if path.startswith("~/"):
+        return "~/" + shlex.quote(path[2:])
+    return shlex.quote(path)
 
 
 def format_result(result: dict) -> str:
     """Format command result for human-readable output."""
     if result.get("success"):
-        output = ""
-        if result.get("stdout"):
-            output += result["stdout"]
-        if result.get("stderr"):
-            if output:
-                output += "\n"
-            output += f"STDERR: {result['stderr']}"
-        return output.strip() or "Command completed successfully (no output)"
+        parts = []
+        stdout = result.get("stdout")
+        stderr = result.get("stderr")
+        if stdout:
+            parts.append(stdout)
+        if stderr:
+            parts.append(f"STDERR: {stderr}")
+        return "\n".join(parts).strip() or "Command completed successfully (no output)"
     else:
         error = result.get("error", "Unknown error")
         stderr = result.get("stderr", "")
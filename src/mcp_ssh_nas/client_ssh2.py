@@ -0,0 +1,229 @@
+"""Optional libssh2-backed client via ssh2-python.
+
+libssh2 does SSH packetization and crypto in C, so on small-command,
+high-QPS workloads where paramiko is CPU-bound on framing it sustains
+several times the throughput. The backend is opt-in: install the
+``ssh2`` extra and set ``MCP_SSH_BACKEND=ssh2``; paramiko stays the
+default (and the only backend exercised by the test suite).
+
+SSH2Client mirrors the SSHClient surface the operations modules use.
+There is no SFTP channel here -- sftp_client() returns None, so file
+operations transparently take their shell fallbacks.
+
+Unlike paramiko's Transport, a libssh2 Session is not thread-safe, so
+all command execution serializes behind a per-session lock and
+supports_concurrency is False: concurrent callers are correct but do
+not overlap their round-trips.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+import time
+from typing import Iterator
+
+from ssh2.session import Session
+
+from mcp_ssh_nas.cache import TTLCache
+from mcp_ssh_nas.config import get_settings
+
+_NOT_CONFIGURED = {
+    "success": False,
+    "error": "NAS credentials not configured. Set NAS_HOST, NAS_USER, and NAS_PASSWORD.",
+}
+
+
+class SSH2Client:
+    """Persistent libssh2 session to the NAS; one channel per command."""
+
+    # libssh2 sessions are not thread-safe: commands serialize behind
+    # _session_lock, so concurrent channels gain nothing here.
+    supports_concurrency = False
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        user: str | None = None,
+        password: str | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.host = (host or settings.host).strip()
+        self.port = port or settings.port
+        self.user = (user or settings.user).strip()
+        self.password = (password or settings.password).strip()
+        self.compression = settings.compression
+        self.cache_ttl = settings.cache_ttl
+        self._configured = bool(self.host and self.user and self.password)
+        self._session: Session | None = None
+        self._sock: socket.socket | None = None
+        self._last_ok = 0.0
+        self._cache = TTLCache(self.cache_ttl)
+        self._connect_lock = threading.Lock()
+        # Serializes every use of the session: libssh2 has no internal
+        # locking, so interleaved channel I/O corrupts the connection.
+        self._session_lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        """Check if NAS credentials are set."""
+        return self._configured
+
+    def _connect(self) -> Session:
+        sock = socket.create_connection((self.host, self.port), timeout=30)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        session = Session()
+        session.handshake(sock)
+        session.userauth_password(self.user, self.password)
+        self._sock = sock
+        self._session = session
+        return session
+
+    def _get_session(self) -> Session:
+        with self._connect_lock:
+            if self._session is not None:
+                return self._session
+            return self._connect()
+
+    def sftp_client(self):
+        """No SFTP channel for this backend; callers use shell fallbacks."""
+        return None
+
+    def execute(self, command: str, timeout: int = 30, max_bytes: int | None = None) -> dict:
+        """Execute a command on the NAS; same result dict as SSHClient."""
+        if not self.configured:
+            return dict(_NOT_CONFIGURED)
+
+        try:
+            with self._session_lock:
+                session = self._get_session()
+                session.set_timeout(timeout * 1000 if timeout else 0)
+                channel = session.open_session()
+                try:
+                    channel.execute(command)
+
+                    stdout_buf = bytearray()
+                    size, data = channel.read()
+                    while size > 0:
+                        stdout_buf += data
+                        if max_bytes is not None and len(stdout_buf) >= max_bytes:
+                            break
+                        size, data = channel.read()
+
+                    stderr_buf = bytearray()
+                    size, data = channel.read_stderr()
+                    while size > 0:
+                        stderr_buf += data
+                        size, data = channel.read_stderr()
+
+                    channel.close()
+                    channel.wait_closed()
+                    exit_status = channel.get_exit_status()
+                finally:
+                    del channel
+
+            self._last_ok = time.monotonic()
+            return {
+                "success": exit_status == 0,
+                "exit_code": exit_status,
+                "stdout": bytes(stdout_buf).decode("utf-8", errors="replace"),
+                "stderr": bytes(stderr_buf).decode("utf-8", errors="replace"),
+            }
+        except Exception as e:
+            # libssh2 errors do not distinguish dead sessions reliably;
+            # drop the connection so the next call re-handshakes.
+            self.close()
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+
+    def execute_fast(self, command: str, timeout: int = 30) -> dict:
+        """Same as execute; libssh2 reports the exit status locally after
+        channel close, so there is no trailing round-trip to skip."""
+        return self.execute(command, timeout)
+
+    def execute_stream(self, command: str, timeout: int = 30) -> Iterator[str]:
+        """Execute a command, yielding decoded output chunks as they arrive.
+
+        stdout is streamed first, then any stderr, matching the error
+        conventions of SSHClient.execute_stream.
+        """
+        if not self.configured:
+            yield f"Error: {_NOT_CONFIGURED['error']}"
+            return
+
+        # The lock is held across the yields: the session stays busy for
+        # the whole stream, so other commands must wait for it anyway.
+        with self._session_lock:
+            try:
+                session = self._get_session()
+                session.set_timeout(timeout * 1000 if timeout else 0)
+                channel = session.open_session()
+            except Exception as e:
+                self.close()
+                yield f"Error: {str(e)}"
+                return
+
+            try:
+                channel.execute(command)
+                size, data = channel.read()
+                while size > 0:
+                    yield data.decode("utf-8", errors="replace")
+                    size, data = channel.read()
+                size, data = channel.read_stderr()
+                while size > 0:
+                    yield data.decode("utf-8", errors="replace")
+                    size, data = channel.read_stderr()
+                channel.close()
+                self._last_ok = time.monotonic()
+            except Exception as e:
+                self.close()
+                yield f"Error: {str(e)}"
+
+    def execute_cached(
+        self,
+        command: str,
+        timeout: int = 30,
+        ttl: float | None = None,
+        refresh: bool = False,
+    ) -> dict:
+        """Execute a read-only command, serving repeats from the TTL cache.
+
+        refresh skips the lookup but still stores the fresh result,
+        matching SSHClient.execute_cached.
+        """
+        if ttl is None:
+            ttl = self.cache_ttl
+        if ttl <= 0:
+            return self.execute(command, timeout)
+
+        if not refresh:
+            cached = self._cache.get(command, ttl)
+            if cached is not None:
+                return cached
+
+        result = self.execute(command, timeout)
+        if result.get("success"):
+            self._cache.set(command, result)
+        else:
+            self._cache.invalidate(command)
+        return result
+
+    async def aexecute(self, command: str, timeout: int = 30, max_bytes: int | None = None) -> dict:
+        """Async variant of execute, run in a worker thread."""
+        return await asyncio.to_thread(self.execute, command, timeout, max_bytes)
+
+    def close(self) -> None:
+        """Close the SSH session and its socket."""
+        if self._session is not None:
+            try:
+                self._session.disconnect()
+            except Exception:
+                pass
+            self._session = None
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+            self._sock = None
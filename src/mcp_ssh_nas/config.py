@@ -1,6 +1,8 @@
 """Pydantic Settings configuration for SSH NAS MCP server."""
 
-from pydantic import Field
+from functools import lru_cache
+
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,12 +10,32 @@ class Settings(BaseSettings):
     """SSH NAS connection configuration.
 
     Reads from environment variables with NAS_ prefix or .env file.
+    Parsed once per process -- always obtain an instance via
+    get_settings() rather than constructing Settings() directly.
     """
 
     host: str = Field(default="", description="NAS hostname or IP address")
     port: int = Field(default=22, description="SSH port")
     user: str = Field(default="", description="SSH username")
     password: str = Field(default="", description="SSH password")
+    compression: bool = Field(
+        default=True,
+        description="Enable SSH zlib compression (3-10x fewer bytes for text-heavy output; disable on fast LANs with weak NAS CPUs)",
+    )
+    cache_ttl: float = Field(
+        default=2.0,
+        description="Seconds to cache read-only command output (0 disables)",
+    )
+    pool_size: int = Field(
+        default=10,
+        description="Maximum concurrent SSH connections in the server pool",
+    )
+
+    @field_validator("host", "user", "password")
+    @classmethod
+    def _strip_whitespace(cls, value: str) -> str:
+        """Strip stray whitespace (e.g. trailing newlines from Docker secrets)."""
+        return value.strip()
 
     model_config = SettingsConfigDict(
         env_prefix="NAS_",
@@ -23,6 +45,11 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get configuration from environment variables or .env file."""
+    """Get configuration from environment variables or .env file.
+
+    Cached so the environment and .env file are only parsed once per
+    process.
+    """
     return Settings()
@@ -9,21 +9,36 @@ Usage:
 
 from __future__ import annotations
 
-import json
-from functools import lru_cache
+import threading
 from typing import Optional
 
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
-from .client import SSHClient
-from .operations import docker, exec, files, services, system
+from .client import SSHClient, create_client, dump_json
+from .operations import batch, docker, exec, files, services, snapshot, system
+
+
+_client: SSHClient | None = None
+_client_lock = threading.Lock()
 
 
-@lru_cache
 def _get_client() -> SSHClient:
-    """Singleton SSHClient configured from environment."""
-    return SSHClient()
+    """Singleton SSH client configured from environment.
+
+    Safe to call from concurrent tool invocations: construction is
+    locked, and the default paramiko client runs each command on its own
+    channel so threads overlap their round-trips. (LangChain's default
+    ainvoke runs sync tools in a thread pool, so asyncio.gather over
+    these tools parallelizes them.) The ssh2 backend is also safe but
+    serializes commands behind a session lock -- see client_ssh2.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+    return _client
 
 
 # =============================================================================
@@ -43,9 +58,20 @@ def ssh_execute(command: str, timeout: int = 30) -> str:
 
 
 @tool
-def ssh_status() -> str:
+def ssh_status(force_refresh: bool = False) -> str:
     """Check the SSH connection status to the NAS."""
-    return json.dumps(exec.check_status(_get_client()), indent=2)
+    return dump_json(exec.check_status(_get_client(), force_refresh=force_refresh))
+
+
+class BatchInput(BaseModel):
+    commands: list[str] = Field(description="Shell commands to run sequentially on the NAS")
+    timeout: int = Field(default=30, description="Timeout in seconds for the combined invocation")
+
+
+@tool(args_schema=BatchInput)
+def ssh_batch(commands: list[str], timeout: int = 30) -> str:
+    """Run several commands on the NAS in a single SSH round-trip. Returns success, exit code and output per command."""
+    return dump_json(batch.run_batch(_get_client(), commands, timeout))
 
 
 # =============================================================================
@@ -93,12 +119,16 @@ def ssh_write_file(path: str, content: str, append: bool = False) -> str:
 
 class FileExistsInput(BaseModel):
     path: str = Field(description="Path to check")
+    info: bool = Field(
+        default=False,
+        description="Also describe the contents via `file` (extra round-trip)",
+    )
 
 
 @tool(args_schema=FileExistsInput)
-def ssh_file_exists(path: str) -> str:
+def ssh_file_exists(path: str, info: bool = False) -> str:
     """Check if a file or directory exists on the NAS."""
-    return json.dumps(files.file_exists(_get_client(), path), indent=2)
+    return dump_json(files.file_exists(_get_client(), path, info=info))
 
 
 # =============================================================================
@@ -131,6 +161,12 @@ def ssh_memory_usage() -> str:
     return system.memory_usage(_get_client())
 
 
+@tool
+def ssh_snapshot(timeout: int = 30, parallel: bool = False) -> str:
+    """Get a whole-host snapshot (hostname, kernel, uptime, disk, memory) from the NAS in one SSH round-trip."""
+    return dump_json(snapshot.snapshot(_get_client(), timeout, parallel=parallel))
+
+
 class ProcessListInput(BaseModel):
     filter: Optional[str] = Field(
         default=None, description="Filter processes by name (grep pattern)"
@@ -140,7 +176,7 @@ class ProcessListInput(BaseModel):
 
 @tool(args_schema=ProcessListInput)
 def ssh_process_list(filter: Optional[str] = None, top: int = 20) -> str:
-    """List running processes on the NAS."""
+    """List running processes on the NAS as a JSON array of {pid, cpu, mem, command}."""
     return system.process_list(_get_client(), filter=filter, top=top)
 
 
@@ -193,6 +229,7 @@ TOOLS = [
     # Core
     ssh_execute,
     ssh_status,
+    ssh_batch,
     # Files
     ssh_list_files,
     ssh_read_file,
@@ -202,6 +239,7 @@ TOOLS = [
     ssh_system_info,
     ssh_disk_usage,
     ssh_memory_usage,
+    ssh_snapshot,
     ssh_process_list,
     # Docker
     ssh_docker_ps,
@@ -0,0 +1,58 @@
+"""Batched command execution -- N commands in one SSH round-trip."""
+
+from __future__ import annotations
+
+from ..client import SSHClient
+
+# ASCII unit/record separators frame each command's output and exit code;
+# vanishingly unlikely to appear in command output.
+_UNIT_SEP = "\x1f"
+_RECORD_SEP = "\x1e"
+
+# Keep one batch within a sane single-exec size.
+MAX_BATCH = 32
+
+
+def run_batch(client: SSHClient, commands: list[str], timeout: int = 30) -> list[dict]:
+    """Run several commands in a single SSH exec and split the output.
+
+    Commands are joined into one remote shell invocation; after each one
+    a printf emits the exit code framed by separator bytes, so N commands
+    cost one round-trip instead of N and still report per-command status.
+
+    Args:
+        commands: Shell commands to run sequentially on the NAS.
+        timeout: Timeout in seconds for the combined invocation.
+
+    Returns:
+        One dict per command with keys success, exit_code, output, in
+        order. On connection failure a single-element list with an error
+        dict is returned.
+    """
+    if not commands:
+        return []
+    if len(commands) > MAX_BATCH:
+        return [{"success": False, "error": f"Too many commands (max {MAX_BATCH})"}]
+
+    joined = "; ".join(f"{cmd}; printf '\\037%s\\036' \"$?\"" for cmd in commands)
+    result = client.execute(joined, timeout)
+
+    if "error" in result:
+        return [{"success": False, "error": result["error"]}]
+
+    sections = result.get("stdout", "").split(_RECORD_SEP)
+    outputs = []
+    for section in sections[: len(commands)]:
+        output, _, code = section.rpartition(_UNIT_SEP)
+        try:
+            exit_code = int(code)
+        except ValueError:
+            exit_code = -1
+        outputs.append(
+            {
+                "success": exit_code == 0,
+                "exit_code": exit_code,
+                "output": output.strip(),
+            }
+        )
+    return outputs
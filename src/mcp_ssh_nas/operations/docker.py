@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import shlex
+
 from ..client import SSHClient, format_result
 
+# docker logs template, rendered once at import.
+_LOGS_TEMPLATE = "docker logs --tail {n} {c}"
+
 
 def docker_ps(client: SSHClient, all: bool = False) -> str:
     """List Docker containers on the NAS.
@@ -29,6 +34,23 @@ def docker_logs(client: SSHClient, container: str, lines: int = 100) -> str:
     Returns:
         Container logs.
     """
-    cmd = f"docker logs --tail {lines} {container}"
+    cmd = _LOGS_TEMPLATE.format(n=lines, c=shlex.quote(container))
     result = client.execute(cmd, timeout=60)
     return format_result(result)
+
+
+def docker_logs_stream(client: SSHClient, container: str, lines: int = 100):
+    """Stream logs from a Docker container as chunks arrive.
+
+    Constant-memory variant of docker_logs: chunks are yielded while the
+    remote command is still producing output.
+
+    Args:
+        container: Container name or ID.
+        lines: Number of lines to show (default: 100).
+
+    Yields:
+        Decoded log chunks (stderr interleaved in arrival order).
+    """
+    cmd = _LOGS_TEMPLATE.format(n=lines, c=shlex.quote(container))
+    yield from client.execute_stream(cmd, timeout=60)
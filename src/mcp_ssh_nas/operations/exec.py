@@ -13,16 +13,21 @@ def execute(client: SSHClient, command: str, timeout: int = 30) -> str:
     Returns:
         Formatted command output or error message.
     """
-    if not command:
+    # Reject blank input before touching the client so a bad call never
+    # pays for (or triggers) a connection.
+    if not command or not command.strip():
         return "Error: No command provided"
 
     result = client.execute(command, timeout)
     return format_result(result)
 
 
-def check_status(client: SSHClient) -> dict:
+def check_status(client: SSHClient, force_refresh: bool = False) -> dict:
     """Check the SSH connection status to the NAS.
 
+    Args:
+        force_refresh: Bypass the short status cache and query the NAS.
+
     Returns:
         dict with connection status, host info, and system details.
     """
@@ -32,7 +37,14 @@ def check_status(client: SSHClient) -> dict:
             "error": "NAS not configured. Set NAS_HOST, NAS_USER, NAS_PASSWORD",
         }
 
-    result = client.execute("hostname && uname -a", 10)
+    # 5s status cache, but honor the NAS_CACHE_TTL=0 kill switch:
+    # operators who disable caching get a live probe every time. A
+    # forced refresh still goes through the cache so the fresh result
+    # replaces any stale entry instead of leaving it behind.
+    ttl = 5.0 if client.cache_ttl > 0 else 0.0
+    result = client.execute_cached(
+        "hostname && uname -a", 10, ttl=ttl, refresh=force_refresh
+    )
 
     if result.get("success"):
         return {
@@ -40,6 +52,7 @@ def check_status(client: SSHClient) -> dict:
             "host": f"{client.host}:{client.port}",
             "user": client.user,
             "system": result.get("stdout", "").strip(),
+            "compression": client.compression,
         }
     else:
         return {
@@ -2,10 +2,48 @@
 
 from __future__ import annotations
 
+import base64
+import codecs
+import io
 import json
+import stat as stat_module
 from typing import Optional
 
-from ..client import SSHClient, format_result
+import paramiko
+
+from ..client import SSHClient, format_result, quote_path
+
+# Bytes per SFTP read when streaming file contents.
+_READ_CHUNK = 65536
+
+# Bytes per SFTP write; pipelining keeps the requests in flight.
+_WRITE_CHUNK = 32768
+
+# Raw bytes per exec in the shell write fallback. base64 inflates 4/3,
+# so 48 KiB stays well under Linux's ~128 KiB per-argument limit
+# (MAX_ARG_STRLEN); larger payloads go out as appended segments.
+_FALLBACK_CHUNK = 49152
+
+# ls command templates keyed by (all, long), rendered once at import.
+_LS_TEMPLATES = {
+    (False, False): "ls {p}",
+    (False, True): "ls -lh {p}",
+    (True, False): "ls -a {p}",
+    (True, True): "ls -lha {p}",
+}
+
+
+def _sftp_path(path: str) -> str:
+    """Map shell-style home paths to SFTP's home-relative form.
+
+    SFTP has no tilde expansion, but relative paths resolve against the
+    login home, so ~/x becomes x (and ~ the home itself).
+    """
+    if path == "~":
+        return "."
+    if path.startswith("~/"):
+        return path[2:]
+    return path
 
 
 def list_files(
@@ -19,11 +57,7 @@ def list_files(
     Returns:
         Directory listing output.
     """
-    flags = "-lh" if long else ""
-    if all:
-        flags += "a"
-
-    cmd = f"ls {flags} {path}" if flags else f"ls {path}"
+    cmd = _LS_TEMPLATES[(all, long)].format(p=quote_path(path))
     result = client.execute(cmd)
     return format_result(result)
 
@@ -42,14 +76,44 @@ def read_file(
         File contents.
     """
     if lines:
+        # Push the slice to the remote side; only the requested lines
+        # travel over the wire.
+        safe = quote_path(path)
         if lines > 0:
-            cmd = f"head -n {lines} {path}"
+            cmd = f"head -n {lines} {safe}"
         else:
-            cmd = f"tail -n {abs(lines)} {path}"
-    else:
-        cmd = f"cat {path}"
-
-    result = client.execute(cmd)
+            cmd = f"tail -n {abs(lines)} {safe}"
+        result = client.execute(cmd)
+        return format_result(result)
+
+    # Full reads go over SFTP: no remote shell/fork, and prefetch
+    # pipelines the read requests instead of waiting per-block.
+    sftp = client.sftp_client()
+    if sftp is not None:
+        try:
+            # Chunked read with incremental decode: peak memory is one
+            # copy of the text plus a chunk, not bytes + str of the
+            # whole file.
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            text = io.StringIO()
+            with sftp.open(_sftp_path(path), "r") as f:
+                f.prefetch()
+                while True:
+                    chunk = f.read(_READ_CHUNK)
+                    if not chunk:
+                        break
+                    text.write(decoder.decode(chunk))
+            text.write(decoder.decode(b"", True))
+            return text.getvalue()
+        except paramiko.SSHException as e:
+            # Connection-level failure, not a per-file error: drop the
+            # channel so the next call reconnects.
+            client.invalidate_sftp()
+            return f"Error: {e}"
+        except IOError as e:
+            return f"Error: {e}"
+
+    result = client.execute(f"cat {quote_path(path)}")
     return format_result(result)
 
 
@@ -64,28 +128,87 @@ def write_file(
     Returns:
         Success or error message.
     """
-    escaped = content.replace("'", "'\\''")
-    operator = ">>" if append else ">"
-    cmd = f"echo '{escaped}' {operator} {path}"
-
-    result = client.execute(cmd)
-    if result.get("success"):
-        return f"Successfully wrote to {path}"
-    return format_result(result)
-
-
-def file_exists(client: SSHClient, path: str) -> dict:
+    # SFTP writes the bytes directly -- no shell quoting, no ARG_MAX
+    # limit, and binary-safe.
+    sftp = client.sftp_client()
+    if sftp is not None:
+        try:
+            data = content.encode()
+            with sftp.open(_sftp_path(path), "ab" if append else "wb") as f:
+                f.set_pipelined(True)
+                for offset in range(0, len(data), _WRITE_CHUNK):
+                    f.write(data[offset : offset + _WRITE_CHUNK])
+            return f"Successfully wrote to {path}"
+        except paramiko.SSHException as e:
+            client.invalidate_sftp()
+            return f"Error: {e}"
+        except IOError as e:
+            return f"Error: {e}"
+
+    # Shell fallback: ship the payload base64-encoded so no byte of the
+    # content needs shell quoting. The encoded text rides in argv, which
+    # Linux caps per argument (MAX_ARG_STRLEN), so large payloads split
+    # into segments -- the first truncates (or appends), the rest append.
+    data = content.encode()
+    safe = quote_path(path)
+    segments = range(0, len(data), _FALLBACK_CHUNK) if data else (0,)
+    for offset in segments:
+        encoded = base64.b64encode(data[offset : offset + _FALLBACK_CHUNK]).decode()
+        operator = ">>" if (append or offset > 0) else ">"
+        cmd = f"printf '%s' {encoded} | base64 -d {operator} {safe}"
+        result = client.execute_fast(cmd)
+        if not result.get("success"):
+            return format_result(result)
+    return f"Successfully wrote to {path}"
+
+
+def file_exists(client: SSHClient, path: str, info: bool = False) -> dict:
     """Check if a file or directory exists.
 
+    Args:
+        info: Also run `file` remotely to describe the contents. Costs
+            an extra exec, so it is off by default.
+
     Returns:
-        dict with exists (bool) and optional info.
+        dict with exists (bool), kind/mode/size when found, and an
+        optional info description.
     """
-    result = client.execute(f"test -e {path} && echo 'exists' || echo 'not found'")
-    output = result.get("stdout", "").strip()
-    exists = output == "exists"
-
-    if exists:
-        type_result = client.execute(f"file {path}")
-        file_info = type_result.get("stdout", "").strip()
-        return {"exists": True, "info": file_info}
+    # One SFTP stat round-trip -- no remote shell or fork at all.
+    sftp = client.sftp_client()
+    if sftp is not None:
+        try:
+            attrs = sftp.stat(_sftp_path(path))
+        except paramiko.SSHException as e:
+            client.invalidate_sftp()
+            return {"exists": False, "error": str(e)}
+        except IOError:
+            return {"exists": False}
+        result = {
+            "exists": True,
+            "kind": "directory" if stat_module.S_ISDIR(attrs.st_mode) else "file",
+            "mode": attrs.st_mode,
+            "size": attrs.st_size,
+        }
+        if info:
+            described = client.execute_fast(f"file {quote_path(path)}")
+            if described.get("success"):
+                result["info"] = described.get("stdout", "").strip()
+        return result
+
+    # Shell fallback: existence check and file type in one exec -- a
+    # single round-trip instead of two, with a NUL delimiter between the
+    # sections.
+    safe = quote_path(path)
+    cmd = (
+        f"if [ -e {safe} ]; then printf 'EXISTS\\0'; file {safe}; "
+        f"else printf 'NOTFOUND'; fi"
+    )
+    result = client.execute(cmd)
+    if "error" in result:
+        return {"exists": False, "error": result["error"]}
+    output = result.get("stdout", "")
+
+    if output.startswith("EXISTS"):
+        _, _, file_info = output.partition("\0")
+        return {"exists": True, "info": file_info.strip()}
     return {"exists": False}
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import shlex
+
 from ..client import SSHClient, format_result
 
 
@@ -14,6 +16,7 @@ def service_status(client: SSHClient, service: str) -> str:
     Returns:
         Service status output.
     """
-    cmd = f"systemctl status {service} 2>/dev/null || service {service} status"
-    result = client.execute(cmd)
+    safe = shlex.quote(service)
+    cmd = f"systemctl status {safe} 2>/dev/null || service {safe} status"
+    result = client.execute_fast(cmd)
     return format_result(result)
@@ -0,0 +1,75 @@
+"""Whole-host snapshot in a single SSH round-trip."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..client import SSHClient
+
+# One exec covering what agents usually ask for as three separate tools
+# (system info, disk, memory). Sections are framed with sentinel lines
+# so the output splits cleanly client-side.
+_SECTIONS = ("host", "uname", "uptime", "df", "free")
+_SECTION_CMDS = {
+    "host": "hostname",
+    "uname": "uname -a",
+    "uptime": "uptime",
+    "df": "df -h",
+    "free": "free -h 2>/dev/null || vm_stat",
+}
+_SNAPSHOT_CMD = "; ".join(
+    f"echo '---{name.upper()}---'; {_SECTION_CMDS[name]}" for name in _SECTIONS
+)
+
+_MARKERS = {f"---{name.upper()}---": name for name in _SECTIONS}
+
+
+def snapshot(client: SSHClient, timeout: int = 30, parallel: bool = False) -> dict:
+    """Collect hostname, kernel, uptime, disk and memory for the host.
+
+    Args:
+        parallel: Run each probe on its own channel in a worker thread
+            instead of one combined exec. With the paramiko backend,
+            channels multiplex over the shared transport and the GIL is
+            released during socket I/O, so wall time becomes
+            max-of-latencies -- worth it when individual probes are slow
+            (e.g. df on a spun-down disk). Backends whose sessions are
+            not thread-safe (supports_concurrency False) fall back to
+            the single exec; the single-exec default also wins when
+            round-trip time dominates.
+
+    Returns:
+        dict with one entry per section (host, uname, uptime, df, free),
+        or an error dict when the command fails.
+    """
+    if parallel and getattr(client, "supports_concurrency", False):
+        return _snapshot_parallel(client, timeout)
+
+    result = client.execute(_SNAPSHOT_CMD, timeout)
+    if not result.get("success"):
+        return {"error": result.get("error", result.get("stderr", "snapshot failed"))}
+
+    sections: dict[str, list[str]] = {}
+    current: list[str] | None = None
+    for line in result.get("stdout", "").splitlines():
+        name = _MARKERS.get(line.strip())
+        if name is not None:
+            current = sections.setdefault(name, [])
+        elif current is not None:
+            current.append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def _snapshot_parallel(client: SSHClient, timeout: int) -> dict:
+    with ThreadPoolExecutor(max_workers=len(_SECTIONS)) as pool:
+        results = list(
+            pool.map(lambda name: client.execute(_SECTION_CMDS[name], timeout), _SECTIONS)
+        )
+
+    out = {}
+    for name, result in zip(_SECTIONS, results):
+        if result.get("success"):
+            out[name] = result.get("stdout", "").strip()
+        else:
+            out[name] = f"Error: {result.get('error', result.get('stderr', 'probe failed'))}"
+    return out
@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+import shlex
 from typing import Optional
 
-from ..client import SSHClient, format_result
+from ..client import SSHClient, dump_json, format_result, quote_path
+
+# ps command templates, rendered once at import. The -eo field list
+# avoids ps's fixed-width padding so less travels over the channel;
+# args (the full command line, last column) keeps filters matching
+# script names and arguments, which a bare comm would truncate away.
+_PS_TOP = "ps -eo pid,pcpu,pmem,args --sort=-pcpu | head -n {n}"
+_PS_FILTERED = "ps -eo pid,pcpu,pmem,args | grep -i {f} | grep -v grep | head -n {n}"
 
 
 def system_info(client: SSHClient) -> str:
@@ -19,7 +27,7 @@ def system_info(client: SSHClient) -> str:
         "echo '=== Uptime ===' && uptime && "
         "echo '=== Load ===' && cat /proc/loadavg 2>/dev/null || uptime"
     )
-    result = client.execute(cmd)
+    result = client.execute_cached(cmd)
     return format_result(result)
 
 
@@ -32,8 +40,8 @@ def disk_usage(client: SSHClient, path: Optional[str] = None) -> str:
     Returns:
         Disk usage output.
     """
-    cmd = f"df -h {path}" if path else "df -h"
-    result = client.execute(cmd)
+    cmd = f"df -h {quote_path(path)}" if path else "df -h"
+    result = client.execute_cached(cmd)
     return format_result(result)
 
 
@@ -44,7 +52,7 @@ def memory_usage(client: SSHClient) -> str:
         Memory usage output.
     """
     cmd = "free -h 2>/dev/null || vm_stat"
-    result = client.execute(cmd)
+    result = client.execute_cached(cmd)
     return format_result(result)
 
 
@@ -60,12 +68,24 @@ def process_list(
         top: Limit to top N processes by CPU/memory.
 
     Returns:
-        Process list output.
+        JSON array of {pid, cpu, mem, command}, parsed once here so
+        callers never re-scan ps output.
     """
     if filter:
-        cmd = f"ps aux | grep -i '{filter}' | grep -v grep | head -n {top}"
+        cmd = _PS_FILTERED.format(f=shlex.quote(filter), n=top)
     else:
-        cmd = f"ps aux --sort=-%cpu | head -n {top + 1}"
+        cmd = _PS_TOP.format(n=top + 1)
 
     result = client.execute(cmd)
-    return format_result(result)
+    if not result.get("success"):
+        return format_result(result)
+
+    processes = []
+    for line in result.get("stdout", "").splitlines():
+        fields = line.split(None, 3)
+        if len(fields) == 4 and fields[0].isdigit():
+            pid, cpu, mem, command = fields
+            processes.append(
+                {"pid": int(pid), "cpu": float(cpu), "mem": float(mem), "command": command}
+            )
+    return dump_json(processes)
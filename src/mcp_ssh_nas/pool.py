@@ -0,0 +1,71 @@
+"""Thread-safe SSH connection pool for concurrent tool invocations."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from .client import SSHClient, create_client
+from .config import get_settings
+
+
+class ConnectionPool:
+    """Pool of SSHClient connections vended to concurrent tool calls.
+
+    Each SSHClient already multiplexes per-command channels over one
+    transport; the pool adds independent transports on top, so parallel
+    fan-out workloads are not serialized behind a single TCP session or
+    stalled by one client's reconnect. Clients are created lazily up to
+    max_connections and validate their own transport liveness on use, so
+    a borrowed connection never needs a separate health probe.
+    """
+
+    def __init__(self, max_connections: int | None = None) -> None:
+        if max_connections is None:
+            max_connections = get_settings().pool_size
+        self._max = max_connections
+        self._idle: queue.Queue[SSHClient] = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _borrow(self) -> SSHClient:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self._max:
+                self._created += 1
+                return create_client()
+        # At capacity: wait for a client to be released.
+        return self._idle.get()
+
+    def _release(self, client: SSHClient) -> None:
+        self._idle.put(client)
+
+    @contextmanager
+    def connection(self) -> Iterator[SSHClient]:
+        """Borrow a client for the duration of a with-block."""
+        client = self._borrow()
+        try:
+            yield client
+        finally:
+            self._release(client)
+
+    def close(self) -> None:
+        """Close all idle pooled connections.
+
+        Each closed client gives its slot back, so the pool stays usable:
+        a later borrow creates a fresh connection instead of blocking at
+        the old high-water mark.
+        """
+        while True:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            client.close()
+            with self._lock:
+                self._created -= 1
@@ -1,211 +1,266 @@
-"""SSH NAS MCP Server -- backward-compatible @mcp.tool wrappers.
+"""SSH NAS MCP Server -- backward-compatible tool wrappers.
 
-Tool names match the original server.py for drop-in replacement.
+Tool names match the original server.py for drop-in replacement. The
+wrappers are generated from a declarative table: each entry names the
+tool, the operation it dispatches to, its signature, and whether the
+result is JSON-serialized. One generic closure replaces fourteen
+hand-written functions, so adding a tool is one table row.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import inspect
 from typing import Optional
 
 from fastmcp import FastMCP
 
-from .client import SSHClient
-from .operations import docker, exec, files, services, system
+from .client import dump_json
+from .operations import batch, docker, exec, files, services, snapshot, system
+from .pool import ConnectionPool
 
 mcp = FastMCP("ssh-nas")
 
-_client: SSHClient | None = None
+_pool = ConnectionPool()
 
+# Marker for parameters without a default.
+_REQUIRED = inspect.Parameter.empty
 
-def _get_client() -> SSHClient:
-    global _client
-    if _client is None:
-        _client = SSHClient()
-    return _client
 
+async def _run_tool(fn, *args, **kwargs):
+    """Run a blocking operation on a pooled client off the event loop.
 
-# --- Core Execution ---
-
-
-@mcp.tool
-def ssh_execute(command: str, timeout: int = 30) -> str:
-    """Execute a command on the NAS via SSH. Use this to run shell commands, check system status, manage files, etc.
-
-    Args:
-        command: The shell command to execute on the NAS
-        timeout: Command timeout in seconds (default: 30)
-
-    Returns:
-        Command output or error message
-    """
-    return exec.execute(_get_client(), command, timeout)
-
-
-@mcp.tool
-def ssh_status() -> str:
-    """Check the SSH connection status to the NAS.
-
-    Returns:
-        JSON with connection status, host info, and system details
-    """
-    return json.dumps(exec.check_status(_get_client()), indent=2)
-
-
-# --- File Operations ---
-
-
-@mcp.tool
-def ssh_list_files(path: str = "~", all: bool = False, long: bool = True) -> str:
-    """List files and directories at a given path.
-
-    Args:
-        path: Directory path to list (default: home directory)
-        all: Include hidden files
-        long: Use long listing format with details
-
-    Returns:
-        Directory listing output
-    """
-    return files.list_files(_get_client(), path, all=all, long=long)
-
-
-@mcp.tool
-def ssh_read_file(path: str, lines: Optional[int] = None) -> str:
-    """Read the contents of a file.
-
-    Args:
-        path: Path to the file to read
-        lines: Number of lines to read (default: all). Use negative for tail.
-
-    Returns:
-        File contents
-    """
-    return files.read_file(_get_client(), path, lines=lines)
-
-
-@mcp.tool
-def ssh_write_file(path: str, content: str, append: bool = False) -> str:
-    """Write content to a file (creates or overwrites).
-
-    Args:
-        path: Path to the file to write
-        content: Content to write to the file
-        append: Append to file instead of overwriting
-
-    Returns:
-        Success or error message
-    """
-    return files.write_file(_get_client(), path, content, append=append)
-
-
-@mcp.tool
-def ssh_file_exists(path: str) -> str:
-    """Check if a file or directory exists.
-
-    Args:
-        path: Path to check
-
-    Returns:
-        JSON with existence status and file info
-    """
-    return json.dumps(files.file_exists(_get_client(), path), indent=2)
-
-
-# --- System Information ---
-
-
-@mcp.tool
-def ssh_system_info() -> str:
-    """Get system information (hostname, OS, uptime, load).
-
-    Returns:
-        System information output
+    FastMCP handlers are async; paramiko is synchronous, so each call is
+    pushed to a worker thread. Paramiko releases the GIL during socket
+    I/O, so concurrent tool calls genuinely overlap their round-trips.
     """
-    return system.system_info(_get_client())
-
-
-@mcp.tool
-def ssh_disk_usage(path: Optional[str] = None) -> str:
-    """Get disk usage information.
 
-    Args:
-        path: Specific path to check (default: all filesystems)
-
-    Returns:
-        Disk usage output
+    def _call():
+        with _pool.connection() as client:
+            return fn(client, *args, **kwargs)
+
+    return await asyncio.to_thread(_call)
+
+
+# Tool table: (name, operation, docstring, params, json_result).
+# params is a list of (name, annotation, default); json_result wraps the
+# return value in dump_json before handing it to the client.
+_TOOLS_SPEC = [
+    # --- Core Execution ---
+    (
+        "ssh_execute",
+        exec.execute,
+        "Execute a command on the NAS via SSH. Use this to run shell "
+        "commands, check system status, manage files, etc.\n\n"
+        "Args:\n"
+        "    command: The shell command to execute on the NAS\n"
+        "    timeout: Command timeout in seconds (default: 30)\n\n"
+        "Returns:\n"
+        "    Command output or error message",
+        [("command", str, _REQUIRED), ("timeout", int, 30)],
+        False,
+    ),
+    (
+        "ssh_status",
+        exec.check_status,
+        "Check the SSH connection status to the NAS.\n\n"
+        "Args:\n"
+        "    force_refresh: Bypass the short status cache and query the NAS\n\n"
+        "Returns:\n"
+        "    JSON with connection status, host info, and system details",
+        [("force_refresh", bool, False)],
+        True,
+    ),
+    (
+        "ssh_batch",
+        batch.run_batch,
+        "Run several commands on the NAS in a single SSH round-trip.\n\n"
+        "Args:\n"
+        "    commands: Shell commands to run sequentially\n"
+        "    timeout: Timeout in seconds for the combined invocation\n\n"
+        "Returns:\n"
+        "    JSON array with success, exit_code and output per command",
+        [("commands", list[str], _REQUIRED), ("timeout", int, 30)],
+        True,
+    ),
+    # --- File Operations ---
+    (
+        "ssh_list_files",
+        files.list_files,
+        "List files and directories at a given path.\n\n"
+        "Args:\n"
+        "    path: Directory path to list (default: home directory)\n"
+        "    all: Include hidden files\n"
+        "    long: Use long listing format with details\n\n"
+        "Returns:\n"
+        "    Directory listing output",
+        [("path", str, "~"), ("all", bool, False), ("long", bool, True)],
+        False,
+    ),
+    (
+        "ssh_read_file",
+        files.read_file,
+        "Read the contents of a file.\n\n"
+        "Args:\n"
+        "    path: Path to the file to read\n"
+        "    lines: Number of lines to read (default: all). Use negative for tail.\n\n"
+        "Returns:\n"
+        "    File contents",
+        [("path", str, _REQUIRED), ("lines", Optional[int], None)],
+        False,
+    ),
+    (
+        "ssh_write_file",
+        files.write_file,
+        "Write content to a file (creates or overwrites).\n\n"
+        "Args:\n"
+        "    path: Path to the file to write\n"
+        "    content: Content to write to the file\n"
+        "    append: Append to file instead of overwriting\n\n"
+        "Returns:\n"
+        "    Success or error message",
+        [("path", str, _REQUIRED), ("content", str, _REQUIRED), ("append", bool, False)],
+        False,
+    ),
+    (
+        "ssh_file_exists",
+        files.file_exists,
+        "Check if a file or directory exists.\n\n"
+        "Args:\n"
+        "    path: Path to check\n"
+        "    info: Also describe the contents via `file` (extra round-trip)\n\n"
+        "Returns:\n"
+        "    JSON with existence status, kind, mode, size and optional info",
+        [("path", str, _REQUIRED), ("info", bool, False)],
+        True,
+    ),
+    # --- System Information ---
+    (
+        "ssh_system_info",
+        system.system_info,
+        "Get system information (hostname, OS, uptime, load).\n\n"
+        "Returns:\n"
+        "    System information output",
+        [],
+        False,
+    ),
+    (
+        "ssh_disk_usage",
+        system.disk_usage,
+        "Get disk usage information.\n\n"
+        "Args:\n"
+        "    path: Specific path to check (default: all filesystems)\n\n"
+        "Returns:\n"
+        "    Disk usage output",
+        [("path", Optional[str], None)],
+        False,
+    ),
+    (
+        "ssh_memory_usage",
+        system.memory_usage,
+        "Get memory usage information.\n\n"
+        "Returns:\n"
+        "    Memory usage output",
+        [],
+        False,
+    ),
+    (
+        "ssh_process_list",
+        system.process_list,
+        "List running processes.\n\n"
+        "Args:\n"
+        "    filter: Filter processes by name (grep pattern)\n"
+        "    top: Limit to top N processes by CPU/memory\n\n"
+        "Returns:\n"
+        "    JSON array of {pid, cpu, mem, command}",
+        [("filter", Optional[str], None), ("top", int, 20)],
+        False,
+    ),
+    (
+        "ssh_snapshot",
+        snapshot.snapshot,
+        "Get a whole-host snapshot (hostname, kernel, uptime, disk, memory) "
+        "in a single SSH round-trip.\n\n"
+        "Args:\n"
+        "    timeout: Timeout in seconds for the combined probe\n"
+        "    parallel: Run the probes concurrently on separate channels\n\n"
+        "Returns:\n"
+        "    JSON with host, uname, uptime, df and free sections",
+        [("timeout", int, 30), ("parallel", bool, False)],
+        True,
+    ),
+    # --- Docker Operations ---
+    (
+        "ssh_docker_ps",
+        docker.docker_ps,
+        "List Docker containers on the NAS.\n\n"
+        "Args:\n"
+        "    all: Show all containers (including stopped)\n\n"
+        "Returns:\n"
+        "    Docker container list",
+        [("all", bool, False)],
+        False,
+    ),
+    (
+        "ssh_docker_logs",
+        docker.docker_logs,
+        "Get logs from a Docker container.\n\n"
+        "Args:\n"
+        "    container: Container name or ID\n"
+        "    lines: Number of lines to show (default: 100)\n\n"
+        "Returns:\n"
+        "    Container logs",
+        [("container", str, _REQUIRED), ("lines", int, 100)],
+        False,
+    ),
+    # --- Service Management ---
+    (
+        "ssh_service_status",
+        services.service_status,
+        "Check status of a service (systemctl/service).\n\n"
+        "Args:\n"
+        "    service: Service name to check\n\n"
+        "Returns:\n"
+        "    Service status output",
+        [("service", str, _REQUIRED)],
+        False,
+    ),
+]
+
+
+def _make_tool(name, fn, doc, params, json_result):
+    """Build one async tool wrapper with an explicit signature.
+
+    FastMCP derives the input schema from the wrapper's signature and
+    annotations, so both are set to match the declared params.
     """
-    return system.disk_usage(_get_client(), path=path)
-
-
-@mcp.tool
-def ssh_memory_usage() -> str:
-    """Get memory usage information.
-
-    Returns:
-        Memory usage output
-    """
-    return system.memory_usage(_get_client())
-
-
-@mcp.tool
-def ssh_process_list(filter: Optional[str] = None, top: int = 20) -> str:
-    """List running processes.
-
-    Args:
-        filter: Filter processes by name (grep pattern)
-        top: Limit to top N processes by CPU/memory
-
-    Returns:
-        Process list output
-    """
-    return system.process_list(_get_client(), filter=filter, top=top)
-
-
-# --- Docker Operations ---
 
-
-@mcp.tool
-def ssh_docker_ps(all: bool = False) -> str:
-    """List Docker containers on the NAS.
-
-    Args:
-        all: Show all containers (including stopped)
-
-    Returns:
-        Docker container list
-    """
-    return docker.docker_ps(_get_client(), all=all)
-
-
-@mcp.tool
-def ssh_docker_logs(container: str, lines: int = 100) -> str:
-    """Get logs from a Docker container.
-
-    Args:
-        container: Container name or ID
-        lines: Number of lines to show (default: 100)
-
-    Returns:
-        Container logs
-    """
-    return docker.docker_logs(_get_client(), container, lines=lines)
-
-
-# --- Service Management ---
-
-
-@mcp.tool
-def ssh_service_status(service: str) -> str:
-    """Check status of a service (systemctl/service).
-
-    Args:
-        service: Service name to check
-
-    Returns:
-        Service status output
-    """
-    return services.service_status(_get_client(), service)
+    async def _wrapper(**kwargs) -> str:
+        result = await _run_tool(fn, **kwargs)
+        return dump_json(result) if json_result else result
+
+    _wrapper.__name__ = name
+    _wrapper.__qualname__ = name
+    _wrapper.__doc__ = doc
+    _wrapper.__signature__ = inspect.Signature(
+        [
+            inspect.Parameter(
+                pname,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                annotation=annotation,
+                default=default,
+            )
+            for pname, annotation, default in params
+        ],
+        return_annotation=str,
+    )
+    _wrapper.__annotations__ = {pname: ann for pname, ann, _ in params}
+    _wrapper.__annotations__["return"] = str
+    return _wrapper
+
+
+for _spec in _TOOLS_SPEC:
+    mcp.tool(_make_tool(*_spec))
 
 
 def main():
@@ -6,7 +6,7 @@ from mcp_ssh_nas.langchain_tools import TOOLS
 
 
 def test_tools_count():
-    assert len(TOOLS) == 13
+    assert len(TOOLS) == 15
 
 
 def test_all_tools_are_base_tool():
@@ -29,6 +29,7 @@ def test_expected_tools_present():
     expected = {
         "ssh_execute",
         "ssh_status",
+        "ssh_batch",
         "ssh_list_files",
         "ssh_read_file",
         "ssh_write_file",
@@ -36,6 +37,7 @@ def test_expected_tools_present():
         "ssh_system_info",
         "ssh_disk_usage",
         "ssh_memory_usage",
+        "ssh_snapshot",
         "ssh_process_list",
         "ssh_docker_ps",
         "ssh_docker_logs",
@@ -1,30 +1,76 @@
 """Tests for SSH NAS operations using mock paramiko."""
 
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from mcp_ssh_nas.client import SSHClient, format_result
-from mcp_ssh_nas.operations import docker, exec, files, services, system
+from mcp_ssh_nas.operations import batch, docker, exec, files, services, snapshot, system
+from mcp_ssh_nas.pool import ConnectionPool
 
 
-def _make_exec_result(stdout_text: str, stderr_text: str = "", exit_code: int = 0):
-    """Helper to build a mock exec_command return value."""
-    stdin = MagicMock()
-    stdout = MagicMock()
-    stderr = MagicMock()
-    stdout.read.return_value = stdout_text.encode()
-    stderr.read.return_value = stderr_text.encode()
-    stdout.channel.recv_exit_status.return_value = exit_code
-    return stdin, stdout, stderr
+class _FakeChannel:
+    """Stateful stand-in for a paramiko session channel running one command."""
+
+    def __init__(self, stdout_text: str, stderr_text: str = "", exit_code: int = 0):
+        self._stdout = stdout_text.encode()
+        self._stderr = stderr_text.encode()
+        self._exit_code = exit_code
+        self.command = None
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        self.command = command
+
+    def set_combine_stderr(self, combine):
+        pass
+
+    def recv_ready(self):
+        return bool(self._stdout)
+
+    def recv_stderr_ready(self):
+        return bool(self._stderr)
+
+    def recv(self, size):
+        data, self._stdout = self._stdout[:size], self._stdout[size:]
+        return data
+
+    def recv_stderr(self, size):
+        data, self._stderr = self._stderr[:size], self._stderr[size:]
+        return data
+
+    def exit_status_ready(self):
+        return True
+
+    def recv_exit_status(self):
+        return self._exit_code
+
+    def close(self):
+        self.closed = True
+
+
+def _make_channel(stdout_text: str, stderr_text: str = "", exit_code: int = 0):
+    """Helper to build a fake session channel for one command."""
+    return _FakeChannel(stdout_text, stderr_text, exit_code)
+
+
+def _make_sftp():
+    """Helper to build a mock SFTP client that passes the liveness check."""
+    sftp = MagicMock()
+    sftp.get_channel.return_value.closed = False
+    return sftp
 
 
 @pytest.fixture
 def client():
     """Create an SSHClient with test credentials and a mocked paramiko connection."""
     c = SSHClient(host="10.0.0.1", port=22, user="testuser", password="testpass")
-    mock_ssh = MagicMock()
-    c._client = mock_ssh
+    c._client = MagicMock()
+    c._transport = MagicMock()
     return c
 
 
@@ -66,7 +112,7 @@ def test_format_result_error():
 
 
 def test_execute(client):
-    client._client.exec_command.return_value = _make_exec_result("output line\n")
+    client._transport.open_session.return_value = _make_channel("output line\n")
     result = exec.execute(client, "echo hello")
     assert "output line" in result
 
@@ -76,63 +122,351 @@ def test_execute_empty_command(client):
     assert "Error" in result
 
 
+def test_execute_whitespace_command():
+    # Must reject before any connection is attempted
+    c = SSHClient(host="h", user="u", password="p")
+    result = exec.execute(c, "   \n")
+    assert "Error" in result
+
+
 def test_check_status(client):
-    client._client.exec_command.return_value = _make_exec_result("mynas\nLinux mynas 5.15\n")
+    client._transport.open_session.return_value = _make_channel("mynas\nLinux mynas 5.15\n")
     result = exec.check_status(client)
     assert result["status"] == "connected"
     assert "10.0.0.1" in result["host"]
 
 
+def test_check_status_cache_disabled(client):
+    # NAS_CACHE_TTL=0 must disable the status cache entirely
+    client.cache_ttl = 0
+    client._transport.open_session.side_effect = [
+        _make_channel("mynas\nLinux 5.15\n"),
+        _make_channel("mynas\nLinux 5.16\n"),
+    ]
+    exec.check_status(client)
+    second = exec.check_status(client)
+    assert "5.16" in second["system"]
+
+
+def test_check_status_force_refresh_updates_cache(client):
+    # A forced probe must replace the cached entry: a non-forced call
+    # right after sees the fresh result without another exec.
+    client._transport.open_session.side_effect = [
+        _make_channel("mynas\nLinux 5.15\n"),
+        _make_channel("mynas\nLinux 5.16\n"),
+    ]
+    exec.check_status(client)
+    exec.check_status(client, force_refresh=True)
+    cached = exec.check_status(client)
+    assert "5.16" in cached["system"]
+    assert client._transport.open_session.call_count == 2
+
+
 def test_check_status_not_configured():
     c = SSHClient()
     result = exec.check_status(c)
     assert result["status"] == "error"
 
 
+def test_ttl_cache_set_get_invalidate():
+    from mcp_ssh_nas.cache import TTLCache
+
+    cache = TTLCache(ttl=60.0)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    cache.invalidate("key")
+    assert cache.get("key") is None
+
+
+def test_execute_cached(client):
+    client._transport.open_session.side_effect = [
+        _make_channel("first\n"),
+        _make_channel("second\n"),
+    ]
+    first = client.execute_cached("uptime")
+    second = client.execute_cached("uptime")
+    assert first["stdout"] == "first\n"
+    assert second["stdout"] == "first\n"  # served from cache, no second exec
+
+
+# =============================================================================
+# Connection pool
+# =============================================================================
+
+
+def test_pool_reuses_released_client():
+    pool = ConnectionPool(max_connections=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+
+def test_pool_vends_distinct_clients_concurrently():
+    pool = ConnectionPool(max_connections=2)
+    with pool.connection() as first:
+        with pool.connection() as second:
+            assert second is not first
+
+
+def test_pool_usable_after_close():
+    # close() must give slots back, or a later borrow blocks forever
+    # at the old high-water mark.
+    pool = ConnectionPool(max_connections=1)
+    with pool.connection() as first:
+        pass
+    pool.close()
+    assert pool._created == 0
+    with pool.connection() as fresh:
+        assert fresh is not first
+
+
+# =============================================================================
+# Batch operations
+# =============================================================================
+
+
+def test_run_batch(client):
+    client._transport.open_session.return_value = _make_channel(
+        "mynas\n\x1f0\x1e/dev/sda1  50G  20G  30G  40% /\n\x1f1\x1e"
+    )
+    results = batch.run_batch(client, ["hostname", "df -h /"])
+    assert results == [
+        {"success": True, "exit_code": 0, "output": "mynas"},
+        {"success": False, "exit_code": 1, "output": "/dev/sda1  50G  20G  30G  40% /"},
+    ]
+
+
+def test_run_batch_too_many():
+    c = SSHClient(host="h", user="u", password="p")
+    results = batch.run_batch(c, ["true"] * (batch.MAX_BATCH + 1))
+    assert results[0]["success"] is False
+    assert "max" in results[0]["error"]
+
+
+def test_run_batch_empty():
+    c = SSHClient(host="h", user="u", password="p")
+    assert batch.run_batch(c, []) == []
+
+
 # =============================================================================
 # File operations
 # =============================================================================
 
 
 def test_list_files(client):
-    client._client.exec_command.return_value = _make_exec_result("file1\nfile2\n")
+    client._transport.open_session.return_value = _make_channel("file1\nfile2\n")
     result = files.list_files(client, "/tmp")
     assert "file1" in result
 
 
+def test_list_files_default_home(client):
+    # The default path must stay shell-expandable, not become 'ls '~''
+    channel = _make_channel("file1\n")
+    client._transport.open_session.return_value = channel
+    files.list_files(client)
+    assert channel.command == "ls -lh ~"
+
+
+def test_quote_path_tilde():
+    from mcp_ssh_nas.client import quote_path
+
+    assert quote_path("~") == "~"
+    assert quote_path("~/my dir") == "~/'my dir'"
+    assert quote_path("/tmp/plain") == "/tmp/plain"
+    assert quote_path("evil; rm -rf /") == "'evil; rm -rf /'"
+
+
 def test_read_file(client):
-    client._client.exec_command.return_value = _make_exec_result("line1\nline2\n")
+    sftp = _make_sftp()
+    sftp.open.return_value.__enter__.return_value.read.side_effect = [
+        b"line1\n",
+        b"line2\n",
+        b"",
+    ]
+    client._sftp = sftp
     result = files.read_file(client, "/etc/hostname")
     assert "line1" in result
 
 
+def test_read_file_lines(client):
+    # Partial reads stay on the exec path so the slice happens remotely
+    client._transport.open_session.return_value = _make_channel("line1\nline2\n")
+    result = files.read_file(client, "/var/log/syslog", lines=2)
+    assert "line2" in result
+
+
+def test_write_file(client):
+    sftp = _make_sftp()
+    client._sftp = sftp
+    result = files.write_file(client, "/tmp/out.txt", "hello")
+    assert "Successfully wrote" in result
+    sftp.open.assert_called_once_with("/tmp/out.txt", "wb")
+
+
+def test_write_file_fallback_chunks_large_content(client):
+    # Without SFTP the payload rides base64-encoded in argv, which Linux
+    # caps per argument -- large writes must split into appended segments.
+    client.sftp_client = MagicMock(return_value=None)
+    channels = []
+
+    def _open_session(**kwargs):
+        channel = _make_channel("\x04RC=0\x04")
+        channels.append(channel)
+        return channel
+
+    client._transport.open_session.side_effect = _open_session
+    content = "x" * (files._FALLBACK_CHUNK + 100)
+    result = files.write_file(client, "/tmp/big.txt", content)
+    assert "Successfully wrote" in result
+    assert len(channels) == 2
+    assert " > " in channels[0].command
+    assert " >> " in channels[1].command
+
+
 def test_file_exists_true(client):
-    # Health check + test -e + file command = 3 calls through exec_command
-    # The health check (echo) fires each time execute() calls _get_client()
-    client._client.exec_command.side_effect = [
-        _make_exec_result(""),           # health check for test -e
-        _make_exec_result("exists\n"),   # test -e returns "exists"
-        _make_exec_result(""),           # health check for file command
-        _make_exec_result("/tmp/test: ASCII text\n"),  # file type info
-    ]
+    sftp = _make_sftp()
+    sftp.stat.return_value.st_mode = 0o100644
+    sftp.stat.return_value.st_size = 42
+    client._sftp = sftp
     result = files.file_exists(client, "/tmp/test")
     assert result["exists"] is True
+    assert result["kind"] == "file"
+    assert result["size"] == 42
+
+
+def test_file_exists_with_info(client):
+    sftp = _make_sftp()
+    sftp.stat.return_value.st_mode = 0o100644
+    sftp.stat.return_value.st_size = 42
+    client._sftp = sftp
+    client._transport.open_session.return_value = _make_channel(
+        "/tmp/test: ASCII text\n\x04RC=0\x04"
+    )
+    result = files.file_exists(client, "/tmp/test", info=True)
     assert "ASCII" in result["info"]
 
 
 def test_file_exists_false(client):
-    client._client.exec_command.return_value = _make_exec_result("not found\n")
+    sftp = _make_sftp()
+    sftp.stat.side_effect = FileNotFoundError("/nonexistent")
+    client._sftp = sftp
     result = files.file_exists(client, "/nonexistent")
     assert result["exists"] is False
 
 
+def test_read_file_drops_sftp_on_ssh_error(client):
+    # A connection-level failure must invalidate the cached channel so
+    # the next call reconnects instead of failing forever
+    import paramiko
+
+    sftp = _make_sftp()
+    sftp.open.side_effect = paramiko.SSHException("connection lost")
+    client._sftp = sftp
+    result = files.read_file(client, "/etc/hostname")
+    assert "Error" in result
+    assert client._sftp is None
+
+
+def test_sftp_client_reopens_closed_channel(client):
+    stale = _make_sftp()
+    stale.get_channel.return_value.closed = True
+    client._sftp = stale
+    fresh = client.sftp_client()
+    assert fresh is not stale
+    client._client.open_sftp.assert_called_once()
+
+
+def test_file_exists_shell_fallback(client):
+    # Without an SFTP subsystem the check still costs only one exec
+    client._client.open_sftp.side_effect = Exception("no sftp")
+    client._transport.open_session.return_value = _make_channel(
+        "EXISTS\0/tmp/test: ASCII text\n"
+    )
+    result = files.file_exists(client, "/tmp/test")
+    assert result["exists"] is True
+    assert "ASCII" in result["info"]
+
+
+# =============================================================================
+# System operations
+# =============================================================================
+
+
+def test_snapshot_sections(client):
+    client._transport.open_session.return_value = _make_channel(
+        "---HOST---\nmynas\n---UNAME---\nLinux mynas 5.15\n---UPTIME---\n"
+        "up 3 days\n---DF---\n/dev/sda1 50G\n---FREE---\nMem: 8G\n"
+    )
+    result = snapshot.snapshot(client)
+    assert result["host"] == "mynas"
+    assert result["df"] == "/dev/sda1 50G"
+    assert set(result) == {"host", "uname", "uptime", "df", "free"}
+
+
+def test_snapshot_parallel(client):
+    # Each probe gets its own channel; the fake echoes its command back
+    # so results can be matched to sections regardless of thread order.
+    def _open_session(**kwargs):
+        channel = _FakeChannel("")
+
+        def _exec(command, _channel=channel):
+            _channel.command = command
+            _channel._stdout = f"ran {command}".encode()
+
+        channel.exec_command = _exec
+        return channel
+
+    client._transport.open_session.side_effect = _open_session
+    result = snapshot.snapshot(client, parallel=True)
+    assert result["host"] == "ran hostname"
+    assert result["uname"] == "ran uname -a"
+    assert set(result) == {"host", "uname", "uptime", "df", "free"}
+
+
+def test_snapshot_parallel_falls_back_without_concurrency(client):
+    # Backends whose sessions are not thread-safe must take the
+    # single combined exec even when parallel=True was requested.
+    client.supports_concurrency = False
+    channel = _make_channel("---HOST---\nmynas\n---UNAME---\nLinux\n")
+    client._transport.open_session.return_value = channel
+    result = snapshot.snapshot(client, parallel=True)
+    assert result["host"] == "mynas"
+    assert client._transport.open_session.call_count == 1
+    assert channel.command == snapshot._SNAPSHOT_CMD
+
+
+def test_process_list_structured(client):
+    client._transport.open_session.return_value = _make_channel(
+        "  PID %CPU %MEM COMMAND\n"
+        "  123 12.5  1.0 python server.py --port 80\n"
+        "  456  0.2  0.5 sshd\n"
+    )
+    result = system.process_list(client)
+    processes = json.loads(result)
+    # args column: the full command line survives, not just the comm name
+    assert processes[0] == {
+        "pid": 123,
+        "cpu": 12.5,
+        "mem": 1.0,
+        "command": "python server.py --port 80",
+    }
+    assert len(processes) == 2
+
+
 # =============================================================================
 # Docker operations
 # =============================================================================
 
 
+def test_docker_logs_stream(client):
+    client._transport.open_session.return_value = _make_channel("log line 1\nlog line 2\n")
+    chunks = list(docker.docker_logs_stream(client, "nginx"))
+    assert "log line 2" in "".join(chunks)
+
+
 def test_docker_ps(client):
-    client._client.exec_command.return_value = _make_exec_result(
+    client._transport.open_session.return_value = _make_channel(
         "CONTAINER ID   IMAGE   STATUS\nabc123   nginx   Up 2 hours\n"
     )
     result = docker.docker_ps(client)
@@ -145,8 +479,17 @@ def test_docker_ps(client):
 
 
 def test_service_status(client):
-    client._client.exec_command.return_value = _make_exec_result(
-        "docker.service - Docker\n   Active: active (running)\n"
+    # execute_fast pipes the exit code through stdout behind a sentinel
+    client._transport.open_session.return_value = _make_channel(
+        "docker.service - Docker\n   Active: active (running)\n\x04RC=0\x04"
     )
     result = services.service_status(client, "docker")
     assert "active" in result
+    assert "RC=" not in result
+
+
+def test_execute_fast_failure(client):
+    client._transport.open_session.return_value = _make_channel("\x04RC=3\x04")
+    result = client.execute_fast("systemctl status nope")
+    assert result["success"] is False
+    assert result["exit_code"] == 3